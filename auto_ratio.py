@@ -2,8 +2,14 @@ import base64
 import gzip
 import sys
 import os
-import urllib.request
-import urllib.parse
+from array import array
+
+# python-isal's igzip is a drop-in for gzip and roughly twice as fast;
+# fall back to the standard library when it isn't installed
+try:
+    from isal import igzip as gzip_impl
+except ImportError:
+    gzip_impl = gzip
 
 # Geometry Dash Constants
 # Gamemode Portal IDs
@@ -41,6 +47,18 @@ SPEED_VALUES = {
 PORTAL_NAME_TO_SPEED_NAME = {'0.5x': 'Slow', '1x': 'Normal', '2x': 'Fast', '3x': 'Very Fast', '4x': 'Faster'}
 SPEED_NAME_TO_PORTAL_NAME = {v: k for k, v in PORTAL_NAME_TO_SPEED_NAME.items()}
 
+# Portal kinds and value tables for the parallel portal arrays
+PORTAL_KIND_GAMEMODE = 0
+PORTAL_KIND_SPEED = 1
+GAMEMODE_NAMES = list(PORTAL_GAMEMODES.values())
+SPEED_PORTAL_NAMES = list(PORTAL_SPEEDS.values())
+SPEED_VALUES_ARR = [SPEED_VALUES[PORTAL_NAME_TO_SPEED_NAME[name]] for name in SPEED_PORTAL_NAMES]
+
+# Portal ID (as it appears in the raw object bytes) -> (kind, value index),
+# so the scan classifies an object with a single lookup and no int()
+PORTAL_LOOKUP = {str(k).encode(): (PORTAL_KIND_GAMEMODE, i) for i, k in enumerate(PORTAL_GAMEMODES)}
+PORTAL_LOOKUP.update({str(k).encode(): (PORTAL_KIND_SPEED, i) for i, k in enumerate(PORTAL_SPEEDS)})
+
 # Start Settings Mappings (from level header)
 START_GAMEMODES = {
     0: 'Cube',
@@ -50,7 +68,7 @@ START_GAMEMODES = {
     4: 'Wave',
     5: 'Robot',
     6: 'Spider',
-    7: 'Swing Copter',
+    7: 'Swing',
 }
 
 START_SPEEDS = {
@@ -61,130 +79,161 @@ START_SPEEDS = {
     4: 'Faster',
 }
 
+# Start settings as indices into GAMEMODE_NAMES / SPEED_PORTAL_NAMES
+START_GAMEMODE_INDEX = {k: GAMEMODE_NAMES.index(v) for k, v in START_GAMEMODES.items()}
+START_SPEED_INDEX = {k: SPEED_PORTAL_NAMES.index(SPEED_NAME_TO_PORTAL_NAME[v]) for k, v in START_SPEEDS.items()}
+
 def decode_level(data):
-    """Decodes the Geometry Dash level string (Base64 -> Gzip)."""
-    # Fix Base64 padding
-    data = data.replace('-', '+').replace('_', '/')
-    padding = len(data) % 4
-    if padding:
-        data += '=' * (4 - padding)
+    """Decodes the Geometry Dash level bytes (Base64 -> Gzip).
 
+    The result is left as bytes: level content is plain ASCII, so the
+    UTF-8 decode pass and str copy are skipped.
+    """
     try:
-        decoded = base64.b64decode(data)
+        # Level strings use the URL-safe alphabet. Padding still copies the
+        # whole input, so only add it when the length actually needs it.
+        padding = -len(data) % 4
+        if padding:
+            data += b'=' * padding
+        decoded = base64.urlsafe_b64decode(data)
         # Try to decompress gzip
         try:
-            return gzip.decompress(decoded).decode('utf-8')
+            return gzip_impl.decompress(decoded)
         except (gzip.BadGzipFile, ValueError):
             # Might be just base64 encoded without gzip (rare for full levels but possible)
-            return decoded.decode('utf-8', errors='ignore')
+            return decoded
     except Exception as e:
         print(f"Error decoding level data: {e}")
         return None
 
 def parse_object(obj_str):
     """Parses a single object string into a dictionary."""
-    parts = obj_str.split(',')
+    parts = obj_str.split(b',')
     obj = {}
     for i in range(0, len(parts) - 1, 2):
-        try:
-            key = int(parts[i])
-            value = parts[i+1]
-            obj[key] = value
-        except ValueError:
-            continue
+        # Skip non-numeric keys without raising; exceptions are costly here
+        key = parts[i]
+        if key.isdigit():
+            obj[int(key)] = parts[i+1]
     return obj
 
+def header_int(header, key, default=0):
+    """Reads an integer header setting, using the default if missing or empty."""
+    value = header.get(key)
+    return int(value) if value else default
+
+def scan_portals(objects_str):
+    """Collects portals from the object strings and finds the level end X.
+
+    Portals are returned as parallel arrays of X position, kind and value
+    index (into GAMEMODE_NAMES or SPEED_PORTAL_NAMES).
+    """
+    xs = array('d')
+    kinds = array('b')
+    values = array('h')
+    max_x = 0.0
+
+    # Bound once outside the loop; this runs for every object in the level
+    lookup = PORTAL_LOOKUP.get
+
+    for obj_str in objects_str:
+        if not obj_str:
+            continue
+
+        # Objects are almost always saved as "1,<id>,2,<x>,...", so only the
+        # first two pairs are split off; anything else takes the full parse.
+        fields = obj_str.split(b',', 4)
+        if len(fields) >= 4 and fields[0] == b'1' and fields[2] == b'2':
+            id_str = fields[1]
+            x_str = fields[3]
+        else:
+            obj = parse_object(obj_str)
+            if 1 not in obj or 2 not in obj: # ID and X are required
+                continue
+            id_str = obj[1]
+            x_str = obj[2]
+
+        x_pos = float(x_str)
+        if x_pos > max_x:
+            max_x = x_pos
+
+        portal = lookup(id_str)
+        if portal is not None:
+            xs.append(x_pos)
+            kinds.append(portal[0])
+            values.append(portal[1])
+
+    return xs, kinds, values, max_x
+
 def analyze_level(level_string, level_name="Unknown"):
-    """Analyzes the level string and calculates ratios."""
+    """Analyzes the decoded level bytes and calculates ratios."""
     if not level_string:
         return
 
     # Split into objects (separated by ;)
     # The first part is the level header settings
-    parts = level_string.split(';')
+    parts = level_string.split(b';')
     header_str = parts[0]
     objects_str = parts[1:]
 
     # Parse Header for start settings
-    # Header format is also k,v,k,v...
-    header = parse_object(header_str)
-    
-    # Default Start Settings
-    current_gamemode = START_GAMEMODES.get(int(header.get(22, 0)), 'Cube') # kA13 is usually key 22 in raw dict? 
-    # Actually in the raw string, keys are kA13 etc. But in the object string part, it's usually k,v.
-    # Let's try to find kA13 and kA4 in the raw header string if it's not parsed as ints.
-    # The header string usually looks like: kA13,0,kA4,0,...
-    
-    # Re-parsing header specifically for string keys if needed
-    header_parts = header_str.split(',')
-    header_dict = {}
-    for i in range(0, len(header_parts) - 1, 2):
-        header_dict[header_parts[i]] = header_parts[i+1]
-
-    current_gamemode = START_GAMEMODES.get(int(header_dict.get('kA2', 0)), 'Cube')
-    current_speed = START_SPEEDS.get(int(header_dict.get('kA4', 0)), 'Normal')
+    # The header string usually looks like: kS38,...,kA13,0,kA4,0,...
+    # Keys are strings, so it is read as plain k,v pairs.
+    header_parts = header_str.split(b',')
+    it = iter(header_parts)
+    header_dict = dict(zip(it, it))
+
+    # Gamemode and speed are tracked as table indices, not names
+    current_gamemode = START_GAMEMODE_INDEX.get(header_int(header_dict, b'kA2'), START_GAMEMODE_INDEX[0])
+    current_speed = START_SPEED_INDEX.get(header_int(header_dict, b'kA4'), START_SPEED_INDEX[0])
     
     # Check for Platformer Mode (2.2 feature)
-    is_platformer = int(header_dict.get('kA22', 0)) == 1
+    is_platformer = header_int(header_dict, b'kA22') == 1
     if is_platformer:
         print("\n[Warning] This is a Platformer Mode level (2.2).")
         print("Time and ratio calculations based on auto-scrolling speed are NOT accurate.\n")
 
     # Parse Objects
-    portals = []
-    max_x = 0
+    xs, kinds, values, max_x = scan_portals(objects_str)
 
-    for obj_str in objects_str:
-        if not obj_str:
-            continue
-        
-        obj = parse_object(obj_str)
-        if 1 not in obj or 2 not in obj: # ID and X are required
-            continue
-            
-        obj_id = int(obj[1])
-        x_pos = float(obj[2])
-        
-        max_x = max(max_x, x_pos)
-
-        if obj_id in PORTAL_GAMEMODES:
-            portals.append({'x': x_pos, 'type': 'gamemode', 'value': PORTAL_GAMEMODES[obj_id]})
-        elif obj_id in PORTAL_SPEEDS:
-            portals.append({'x': x_pos, 'type': 'speed', 'value': PORTAL_SPEEDS[obj_id]})
-
-    # Sort portals by X position
-    portals.sort(key=lambda p: p['x'])
+    # Sort portals by X position (stable, so same-X portals keep level order)
+    order = sorted(range(len(xs)), key=xs.__getitem__)
 
     # Calculate Durations
-    mode_times = {mode: 0.0 for mode in PORTAL_GAMEMODES.values()}
-    speed_times = {speed: 0.0 for speed in PORTAL_SPEEDS.values()}
-    
+    # Distance is bucketed per (gamemode, speed) state while walking the
+    # portals; the division into seconds happens once per bucket afterwards.
+    speed_count = len(SPEED_PORTAL_NAMES)
+    state_distances = [0.0] * (len(GAMEMODE_NAMES) * speed_count)
     current_x = 0.0
-    total_time = 0.0
 
-    # Add a dummy end portal at the end of the level
-    portals.append({'x': max_x, 'type': 'end', 'value': None})
-
-    for p in portals:
-        next_x = p['x']
+    for i in order:
+        next_x = xs[i]
         if next_x > current_x:
-            distance = next_x - current_x
-            speed_val = SPEED_VALUES[current_speed]
-            duration = distance / speed_val
-            
-            mode_times[current_gamemode] += duration
-            
-            speed_times_key = SPEED_NAME_TO_PORTAL_NAME.get(current_speed, '1x')
-            speed_times[speed_times_key] += duration
-            total_time += duration
-            
+            state_distances[current_gamemode * speed_count + current_speed] += next_x - current_x
             current_x = next_x
-        
+
         # Update state
-        if p['type'] == 'gamemode':
-            current_gamemode = p['value']
-        elif p['type'] == 'speed':
-            current_speed = PORTAL_NAME_TO_SPEED_NAME.get(p['value'], 'Normal')
+        kind = kinds[i]
+        if kind == PORTAL_KIND_GAMEMODE:
+            current_gamemode = values[i]
+        elif kind == PORTAL_KIND_SPEED:
+            current_speed = values[i]
+
+    # Last segment runs from the final portal to the end of the level
+    if max_x > current_x:
+        state_distances[current_gamemode * speed_count + current_speed] += max_x - current_x
+
+    mode_times = [0.0] * len(GAMEMODE_NAMES)
+    speed_times = [0.0] * speed_count
+    total_time = 0.0
+
+    for state, distance in enumerate(state_distances):
+        if distance:
+            gamemode, speed = divmod(state, speed_count)
+            duration = distance / SPEED_VALUES_ARR[speed]
+            mode_times[gamemode] += duration
+            speed_times[speed] += duration
+            total_time += duration
 
     # Output Results
     print(f"\n{'='*30}")
@@ -193,13 +242,13 @@ def analyze_level(level_string, level_name="Unknown"):
     print(f"{'='*30}")
     
     print("\n[Gamemode Ratios]")
-    for mode, time in mode_times.items():
+    for mode, time in zip(GAMEMODE_NAMES, mode_times):
         if time > 0:
             ratio = (time / total_time) * 100
             print(f"{mode:<10}: {ratio:6.2f}% ({time:.2f}s)")
 
     print("\n[Speed Ratios]")
-    for speed, time in speed_times.items():
+    for speed, time in zip(SPEED_PORTAL_NAMES, speed_times):
         if time > 0:
             ratio = (time / total_time) * 100
             print(f"{speed:<10}: {ratio:6.2f}% ({time:.2f}s)")
@@ -207,6 +256,11 @@ def analyze_level(level_string, level_name="Unknown"):
 
 def download_level(level_id):
     """Downloads level data from Geometry Dash servers."""
+    # Imported here: urllib.request alone costs ~30ms at startup, which
+    # every run analysing a local file would otherwise pay for nothing
+    import urllib.request
+    import urllib.parse
+
     print(f"Downloading level {level_id}...")
     url = "http://www.boomlings.com/database/downloadGJLevel22.php"
     params = {
@@ -214,29 +268,28 @@ def download_level(level_id):
         "secret": "Wmfd2893gb7"
     }
     data = urllib.parse.urlencode(params).encode('utf-8')
-    req = urllib.request.Request(url, data=data, headers={'User-Agent': ''})
+    req = urllib.request.Request(url, data=data, headers={'User-Agent': '', 'Accept-Encoding': 'gzip'})
     
     try:
         with urllib.request.urlopen(req) as response:
-            resp_text = response.read().decode('utf-8')
+            raw = response.read()
+            if response.headers.get('Content-Encoding') == 'gzip':
+                raw = gzip_impl.decompress(raw)
+            resp_text = raw.decode('utf-8')
             
         if resp_text == "-1":
             print("Error: Level not found or download failed.")
             return None
             
         # Parse response (k:v format)
-        parts = resp_text.split(':')
-        level_data = None
-        level_name = "Unknown"
-        
-        for i in range(0, len(parts), 2):
-            if parts[i] == '2':
-                level_name = parts[i+1]
-            elif parts[i] == '4':
-                level_data = parts[i+1]
+        it = iter(resp_text.split(':'))
+        response_dict = dict(zip(it, it))
+        level_name = response_dict.get('2', "Unknown")
+        level_data = response_dict.get('4')
         
         if level_data:
-            return level_name, level_data
+            # Level data is Base64 text; hand it on as bytes like a level file
+            return level_name, level_data.encode('ascii')
             
         print("Error: Level data not found in response.")
         return None
@@ -255,12 +308,14 @@ def main():
 
     if os.path.exists(input_arg):
         level_name = os.path.basename(input_arg)
-        with open(input_arg, 'r') as f:
+        with open(input_arg, 'rb') as f:
             raw_data = f.read().strip()
     elif input_arg.isdigit():
         res = download_level(input_arg)
         if res:
             level_name, raw_data = res
+            # Don't let the tuple keep the encoded level alive
+            res = None
     else:
         print("File not found and input is not a valid Level ID.")
         return
@@ -269,12 +324,14 @@ def main():
         return
 
     # Check if it looks like a raw object string or needs decoding
-    if raw_data.startswith('kS') or raw_data.startswith('kA'):
+    if raw_data.startswith((b'kS', b'kA')):
         # Already decoded string
         analyze_level(raw_data, level_name)
     else:
-        # Needs decoding
+        # Needs decoding; drop the encoded copy so it isn't held alongside
+        # the decoded level for the whole analysis
         decoded = decode_level(raw_data)
+        raw_data = None
         if decoded:
             analyze_level(decoded, level_name)
         else: